@@ -19,15 +19,129 @@ Supports:
 import numpy as np
 import cv2
 import argparse
+import mmap
 import requests
 import time
 import threading
-from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional Numba JIT for the hot decode kernels (falls back to NumPy)
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
 # IMX662 sensor configuration
 DEFAULT_WIDTH = 1936
 DEFAULT_HEIGHT = 1100
 
+if HAVE_NUMBA:
+    @njit(parallel=True, cache=True, boundscheck=False, nogil=True)
+    def _unpack_raw10(raw_bytes, out, height, groups_per_row, rot180):
+        """Unpack MIPI RAW10 (5 bytes -> 4 pixels) in a single fused pass
+
+        Writes directly into the preallocated (height, width) uint16 output,
+        avoiding the intermediate plane arrays of the NumPy path. With
+        rot180 the write indices are mirrored, so the usual orientation fix
+        costs nothing extra (the Bayer pattern rotates with the image).
+        """
+        for y in prange(height):
+            row_base = y * groups_per_row * 5
+            yo = height - 1 - y if rot180 else y
+            for g in range(groups_per_row):
+                base = row_base + g * 5
+                low = raw_bytes[base + 4]
+                p0 = (np.uint16(raw_bytes[base]) << 2) | (low & 0x03)
+                p1 = (np.uint16(raw_bytes[base + 1]) << 2) | ((low >> 2) & 0x03)
+                p2 = (np.uint16(raw_bytes[base + 2]) << 2) | ((low >> 4) & 0x03)
+                p3 = (np.uint16(raw_bytes[base + 3]) << 2) | ((low >> 6) & 0x03)
+                if rot180:
+                    col = (groups_per_row - 1 - g) * 4
+                    out[yo, col + 3] = p0
+                    out[yo, col + 2] = p1
+                    out[yo, col + 1] = p2
+                    out[yo, col] = p3
+                else:
+                    col = g * 4
+                    out[yo, col] = p0
+                    out[yo, col + 1] = p1
+                    out[yo, col + 2] = p2
+                    out[yo, col + 3] = p3
+
+    @njit(parallel=True, cache=True, boundscheck=False, nogil=True)
+    def _bin2_debayer(bayer, out, height2, width2, r_off_y, r_off_x):
+        """Average each 2x2 Bayer quad into one half-resolution BGR pixel
+
+        r_off_y/r_off_x locate the red sample inside the quad; green is the
+        mean of the quad's two green samples. Output is downshifted to
+        8-bit, so this replaces demosaic + downscale with a single pass.
+        """
+        for y in prange(height2):
+            yy = y * 2
+            for x in range(width2):
+                xx = x * 2
+                r = bayer[yy + r_off_y, xx + r_off_x]
+                b = bayer[yy + 1 - r_off_y, xx + 1 - r_off_x]
+                g = (bayer[yy + r_off_y, xx + 1 - r_off_x] +
+                     bayer[yy + 1 - r_off_y, xx + r_off_x])
+                out[y, x, 0] = np.uint8(b >> 2)
+                out[y, x, 1] = np.uint8(g >> 3)
+                out[y, x, 2] = np.uint8(r >> 2)
+
+    @njit(parallel=True, cache=True, boundscheck=False, nogil=True)
+    def _rgb565_to_bgr(src, out, height, width):
+        """Decode little-endian RGB565 bytes straight into a BGR image
+
+        One pass over the source bytes; LLVM vectorizes the inner loop.
+        Low bits are replicated so full-scale 565 values reach 255.
+        """
+        for y in prange(height):
+            row = y * width * 2
+            for x in range(width):
+                lo = src[row + 2 * x]
+                hi = src[row + 2 * x + 1]
+                out[y, x, 0] = ((lo << 3) & 0xF8) | ((lo >> 2) & 0x07)
+                out[y, x, 1] = (((hi & 0x07) << 5) | ((lo >> 3) & 0x1C)
+                                | ((hi & 0x06) >> 1))
+                out[y, x, 2] = (hi & 0xF8) | (hi >> 5)
+
+    @njit(parallel=True, fastmath=True, cache=True, nogil=True)
+    def _color_correct(img, out, b_gain, g_gain, r_gain, gamma_lut,
+                       brightness, saturation):
+        """Fused gain + gamma + brightness + saturation in one pixel pass
+
+        Saturation is scaled by pulling each channel toward the pixel
+        maximum (keeps hue and value, same effect as scaling S in HSV)
+        without the BGR->HSV->BGR round-trip.
+        """
+        height, width = img.shape[0], img.shape[1]
+        for y in prange(height):
+            for x in range(width):
+                b = img[y, x, 0] * b_gain
+                g = img[y, x, 1] * g_gain
+                r = img[y, x, 2] * r_gain
+                b = 255.0 if b > 255.0 else b
+                g = 255.0 if g > 255.0 else g
+                r = 255.0 if r > 255.0 else r
+                b = gamma_lut[int(b)] + brightness
+                g = gamma_lut[int(g)] + brightness
+                r = gamma_lut[int(r)] + brightness
+                b = 255.0 if b > 255.0 else (0.0 if b < 0.0 else b)
+                g = 255.0 if g > 255.0 else (0.0 if g < 0.0 else g)
+                r = 255.0 if r > 255.0 else (0.0 if r < 0.0 else r)
+                if saturation != 1.0:
+                    mx = max(b, g, r)
+                    b = mx - (mx - b) * saturation
+                    g = mx - (mx - g) * saturation
+                    r = mx - (mx - r) * saturation
+                    b = 0.0 if b < 0.0 else b
+                    g = 0.0 if g < 0.0 else g
+                    r = 0.0 if r < 0.0 else r
+                out[y, x, 0] = np.uint8(b)
+                out[y, x, 1] = np.uint8(g)
+                out[y, x, 2] = np.uint8(r)
+
 class ImageDecoder:
     """Decode image data from IMX662 (supports RGB888 and RAW formats)"""
 
@@ -56,8 +170,96 @@ class ImageDecoder:
         print(f"  RGB565 frame size: {self.frame_size_rgb565} bytes")
         print(f"  RAW8 frame size: {self.frame_size_raw8} bytes")
 
-        # CLAHE for auto-enhancement
-        self.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        # CLAHE for auto-enhancement. 4x4 tiles are ~484x275 at full
+        # resolution - still local enough for this sensor while doing a
+        # quarter of the histogram work of the old 8x8 grid
+        self.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
+
+        # Offload CLAHE to the GPU when OpenCV was built with CUDA and a
+        # device is present (regular cv2 wheels ship without it)
+        self._cuda_clahe = None
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                self._cuda_clahe = cv2.cuda.createCLAHE(
+                    clipLimit=2.0, tileGridSize=(4, 4))
+                self._gpu_l = cv2.cuda_GpuMat()
+                print("  CLAHE: using CUDA backend")
+        except (AttributeError, cv2.error):
+            self._cuda_clahe = None
+
+        # Preallocated RAW10 output, reused across frames (the Numba
+        # unpacker writes into it directly)
+        self._raw10_out = np.empty((height, width), dtype=np.uint16)
+
+        # RGB565 byte LUTs: high byte -> (R8, G8 high bits),
+        # low byte -> (G8 low bits, B8), with proper LSB replication so
+        # full-scale 565 values map to 255 instead of 248/252
+        idx = np.arange(256, dtype=np.uint16)
+        self._rgb565_lut_hi = np.empty((256, 2), dtype=np.uint8)
+        self._rgb565_lut_hi[:, 0] = (idx & 0xF8) | (idx >> 5)
+        self._rgb565_lut_hi[:, 1] = ((idx & 0x07) << 5) | ((idx & 0x06) >> 1)
+        self._rgb565_lut_lo = np.empty((256, 2), dtype=np.uint8)
+        self._rgb565_lut_lo[:, 0] = (idx >> 3) & 0x1C
+        self._rgb565_lut_lo[:, 1] = ((idx << 3) & 0xF8) | ((idx >> 2) & 0x07)
+        self._rgb565_out = np.empty((height, width, 3), dtype=np.uint8)
+
+        # Gamma LUT cache: (gamma value, 256-entry uint8 table)
+        self._gamma_cache = (None, None)
+
+        # Fused color-correction LUT cache: (params key, (256,1,3) table)
+        self._cc_lut_cache = (None, None)
+
+        # Pool of named scratch buffers reused across frames; reallocated
+        # only if the requested shape or dtype changes
+        self._buffers = {}
+
+        # Bayer pattern tables, built once instead of per call:
+        # pattern -> OpenCV conversion code, and -> red offset in the quad
+        self._bayer_codes = {
+            'RG': cv2.COLOR_BAYER_RG2BGR,  # RGGB
+            'BG': cv2.COLOR_BAYER_BG2BGR,  # BGGR
+            'GR': cv2.COLOR_BAYER_GR2BGR,  # GRBG
+            'GB': cv2.COLOR_BAYER_GB2BGR,  # GBRG
+        }
+        self._bayer_red_offsets = {'RG': (0, 0), 'BG': (1, 1),
+                                   'GR': (0, 1), 'GB': (1, 0)}
+
+        # First-frame debug print flag (plain attribute read in the hot
+        # path instead of a hasattr probe)
+        self._debug_printed = False
+
+        # Request/result flags for folding the 180-degree rotation into
+        # the RAW10 unpack kernel (see process_frame)
+        self._fold_rot180 = False
+        self._unpack_rotated = False
+
+        # Last decoded (pre-correction) image: (raw ref, pattern, image,
+        # format, rotated-in-unpack, binned). Holding the raw object keeps
+        # the cache valid and lets trackbar changes re-run only color
+        # correction, not decode+debayer
+        self._decode_cache = (None, None, None, None, False, False)
+
+        if HAVE_NUMBA:
+            # Prime the JIT kernels on tiny inputs so the first real frame
+            # doesn't stall on compilation (cache=True keeps the compiled
+            # code across runs, this covers the very first one)
+            _unpack_raw10(np.zeros(5, np.uint8),
+                          np.empty((1, 4), np.uint16), 1, 1, False)
+            _bin2_debayer(np.zeros((2, 2), np.uint16),
+                          np.empty((1, 1, 3), np.uint8), 1, 1, 0, 0)
+            _rgb565_to_bgr(np.zeros(2, np.uint8),
+                           np.empty((1, 1, 3), np.uint8), 1, 1)
+            _color_correct(np.zeros((1, 1, 3), np.uint8),
+                           np.empty((1, 1, 3), np.uint8),
+                           1.0, 1.0, 1.0, self._get_gamma_lut(1.0), 0.0, 1.1)
+
+    def _scratch(self, name, shape, dtype):
+        """Get a pooled output buffer, allocating only on first use"""
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype)
+            self._buffers[name] = buf
+        return buf
 
     def decode_rgb888(self, data):
         """Decode RGB888 data (3 bytes per pixel, ISP processed)
@@ -74,12 +276,14 @@ class ImageDecoder:
             print(f"Warning: Expected {expected_size} bytes for RGB888, got {len(data)}")
             return None
 
-        # Convert to numpy array and reshape to (height, width, 3)
-        bgr_bytes = np.frombuffer(data[:expected_size], dtype=np.uint8)
-        bgr_img = bgr_bytes.reshape((self.height, self.width, 3))
+        # Zero-copy: alias the receive buffer directly (count avoids the
+        # data[:expected_size] slice, which would duplicate the frame).
+        # Downstream stages write into their own pooled buffers, so the
+        # read-only view is never mutated
+        bgr_img = np.frombuffer(data, dtype=np.uint8, count=expected_size)
 
         # ESP32 ISP outputs BGR - same as OpenCV, no conversion needed
-        return bgr_img
+        return bgr_img.reshape((self.height, self.width, 3))
 
     def decode_rgb565(self, data):
         """Decode RGB565 data (2 bytes per pixel)"""
@@ -88,17 +292,24 @@ class ImageDecoder:
             print(f"Warning: Expected {expected_size} bytes for RGB565, got {len(data)}")
             return None
 
-        # Convert to numpy array as uint16
-        rgb565 = np.frombuffer(data[:expected_size], dtype=np.uint16)
-        rgb565 = rgb565.reshape((self.height, self.width))
+        arr = np.frombuffer(data, dtype=np.uint8, count=expected_size)
 
-        # Extract R, G, B components
-        r = ((rgb565 >> 11) & 0x1F) << 3  # 5 bits -> 8 bits
-        g = ((rgb565 >> 5) & 0x3F) << 2   # 6 bits -> 8 bits
-        b = (rgb565 & 0x1F) << 3          # 5 bits -> 8 bits
+        if HAVE_NUMBA:
+            # Single fused pass over the source bytes
+            _rgb565_to_bgr(arr, self._rgb565_out, self.height, self.width)
+            return self._rgb565_out
 
-        # Stack into BGR image for OpenCV
-        bgr_img = np.stack([b, g, r], axis=-1).astype(np.uint8)
+        # View as (height, width, 2) bytes: [0] = GGGBBBBB, [1] = RRRRRGGG
+        arr = arr.reshape((self.height, self.width, 2))
+
+        # Two byte-wide gathers replace the six uint16 arithmetic passes
+        hi = self._rgb565_lut_hi[arr[:, :, 1]]
+        lo = self._rgb565_lut_lo[arr[:, :, 0]]
+
+        bgr_img = self._rgb565_out
+        bgr_img[:, :, 0] = lo[:, :, 1]                # B
+        bgr_img[:, :, 1] = hi[:, :, 1] | lo[:, :, 0]  # G
+        bgr_img[:, :, 2] = hi[:, :, 0]                # R
 
         return bgr_img
 
@@ -117,9 +328,11 @@ class ImageDecoder:
         raw_bytes = np.frombuffer(raw_data[:expected_size], dtype=np.uint8)
         bayer_img = raw_bytes.reshape((self.height, self.width))
 
-        # Convert to 16-bit for consistent processing (shift left 2 bits)
-        # This makes it compatible with the 10-bit processing pipeline
-        bayer_16bit = bayer_img.astype(np.uint16) << 2
+        # Widen into the pooled 16-bit buffer and shift in place
+        # (left shift 2 bits for compatibility with the 10-bit pipeline)
+        bayer_16bit = self._scratch('raw8', (self.height, self.width), np.uint16)
+        np.copyto(bayer_16bit, bayer_img)
+        bayer_16bit <<= 2
 
         return bayer_16bit
 
@@ -144,6 +357,14 @@ class ImageDecoder:
         # Convert to numpy array
         raw_bytes = np.frombuffer(raw_data, dtype=np.uint8)
 
+        if HAVE_NUMBA:
+            # One pass over the packed bytes, no temporaries; the 180
+            # orientation fix rides along when requested
+            _unpack_raw10(raw_bytes, self._raw10_out, self.height,
+                          self.width // 4, self._fold_rot180)
+            self._unpack_rotated = self._fold_rot180
+            return self._raw10_out
+
         # Reshape to groups of 5 bytes (4 pixels per group)
         # Total groups = total_pixels / 4
         total_pixels = self.width * self.height
@@ -173,13 +394,13 @@ class ImageDecoder:
         pixel2 = (p2_high << 2) | p2_low
         pixel3 = (p3_high << 2) | p3_low
 
-        # Interleave pixels back into image
+        # Interleave pixels back into the preallocated image buffer with a
+        # single sequential pass: stacking along a new last axis writes each
+        # 4-pixel group contiguously instead of four strided stores
         # Output shape: (height, width)
-        bayer_img = np.zeros((self.height, self.width), dtype=np.uint16)
-        bayer_img[:, 0::4] = pixel0
-        bayer_img[:, 1::4] = pixel1
-        bayer_img[:, 2::4] = pixel2
-        bayer_img[:, 3::4] = pixel3
+        bayer_img = self._raw10_out
+        np.stack((pixel0, pixel1, pixel2, pixel3), axis=-1,
+                 out=bayer_img.reshape(self.height, groups_per_row, 4))
 
         return bayer_img
 
@@ -190,14 +411,12 @@ class ImageDecoder:
             print(f"Warning: Expected {expected_size} bytes for RAW16, got {len(raw_data)}")
             return None
 
-        # Read as 16-bit little-endian
+        # Read as 16-bit little-endian and mask the lower 10 bits
+        # directly into the pooled output buffer
         raw_16bit = np.frombuffer(raw_data, dtype=np.uint16)
-
-        # Extract 10-bit data (mask lower 10 bits)
-        raw_10bit = (raw_16bit & 0x3FF).astype(np.uint16)
-
-        # Reshape to image
-        bayer_img = raw_10bit.reshape((self.height, self.width))
+        bayer_img = self._scratch('raw16', (self.height, self.width), np.uint16)
+        np.bitwise_and(raw_16bit.reshape((self.height, self.width)), 0x3FF,
+                       out=bayer_img)
 
         return bayer_img
 
@@ -258,31 +477,82 @@ class ImageDecoder:
         """Apply debayering with selectable Bayer pattern
 
         Patterns: 'RG' (RGGB), 'BG' (BGGR), 'GR' (GRBG), 'GB' (GBRG)
-        """
-        # Convert 10-bit to 8-bit for OpenCV
-        bayer_8bit = (bayer_img >> 2).astype(np.uint8)
 
+        Demosaics the uint16 plane directly (cvtColor handles CV_16U) so
+        the full 10-bit range survives interpolation; the single downcast
+        to 8-bit happens after.
+        """
         # Select debayering pattern
-        patterns = {
-            'RG': cv2.COLOR_BAYER_RG2BGR,  # RGGB
-            'BG': cv2.COLOR_BAYER_BG2BGR,  # BGGR
-            'GR': cv2.COLOR_BAYER_GR2BGR,  # GRBG
-            'GB': cv2.COLOR_BAYER_GB2BGR,  # GBRG
-        }
+        cv_pattern = self._bayer_codes.get(pattern, cv2.COLOR_BAYER_RG2BGR)
+        bgr16 = cv2.cvtColor(
+            bayer_img, cv_pattern,
+            dst=self._scratch('debayer_bgr16', (self.height, self.width, 3), np.uint16))
+
+        return cv2.convertScaleAbs(
+            bgr16, dst=self._scratch('debayer_bgr', (self.height, self.width, 3), np.uint8),
+            alpha=0.25)
 
-        cv_pattern = patterns.get(pattern, cv2.COLOR_BAYER_RG2BGR)
-        rgb_img = cv2.cvtColor(bayer_8bit, cv_pattern)
+    def debayer_binned(self, bayer_img, pattern='RG'):
+        """Half-resolution debayer: one BGR pixel per 2x2 Bayer quad
 
-        return rgb_img
+        Quarter of the work of full demosaic + downscale; used for the
+        preview path when Numba is available.
+        """
+        h2, w2 = self.height // 2, self.width // 2
+        out = self._scratch('binned_bgr', (h2, w2, 3), np.uint8)
+        r_off_y, r_off_x = self._bayer_red_offsets.get(pattern, (0, 0))
+        _bin2_debayer(bayer_img, out, h2, w2, r_off_y, r_off_x)
+        return out
 
     def enhance_image(self, img):
-        """Apply CLAHE enhancement for better visibility"""
-        lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        l = self.clahe.apply(l)
-        enhanced = cv2.merge([l, a, b])
-        enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
-        return enhanced
+        """Apply CLAHE enhancement for better visibility
+
+        Equalizes the Y plane of YCrCb (a linear 3x3 conversion, far
+        cheaper than the nonlinear LAB round-trip) in place via
+        extract/insertChannel into pooled buffers - no split/merge copies
+        and no per-frame allocations.
+        """
+        h, w = img.shape[:2]
+        ycc = cv2.cvtColor(img, cv2.COLOR_BGR2YCrCb,
+                           dst=self._scratch('ycc', (h, w, 3), np.uint8))
+        y = cv2.extractChannel(ycc, 0,
+                               dst=self._scratch('ycc_y', (h, w), np.uint8))
+        if self._cuda_clahe is not None:
+            # Only the luma plane crosses the PCIe bus, not the BGR image
+            self._gpu_l.upload(y)
+            self._cuda_clahe.apply(self._gpu_l,
+                                   cv2.cuda.Stream_Null()).download(y)
+        else:
+            self.clahe.apply(y, dst=y)
+        cv2.insertChannel(y, ycc, 0)
+        return cv2.cvtColor(ycc, cv2.COLOR_YCrCb2BGR,
+                            dst=self._scratch('enhanced', (h, w, 3), np.uint8))
+
+    def _get_gamma_lut(self, gamma):
+        """256-entry gamma table, rebuilt only when the gamma value changes"""
+        if self._gamma_cache[0] != gamma:
+            ramp = np.arange(256, dtype=np.float32) / 255.0
+            lut = (255.0 * np.power(ramp, 1.0 / gamma)).astype(np.uint8)
+            self._gamma_cache = (gamma, lut)
+        return self._gamma_cache[1]
+
+    def _get_cc_lut(self, b_gain, g_gain, r_gain, gamma, brightness):
+        """(256,1,3) table fusing gain, gamma and brightness per channel
+
+        Rebuilt only when a slider moves; applying it with cv2.LUT turns
+        the whole correction (minus saturation) into a single uint8 gather.
+        """
+        key = (b_gain, g_gain, r_gain, gamma, brightness)
+        if self._cc_lut_cache[0] != key:
+            ramp = np.arange(256, dtype=np.float32)
+            gamma_lut = self._get_gamma_lut(gamma).astype(np.int16)
+            lut = np.empty((256, 1, 3), dtype=np.uint8)
+            for c, gain in enumerate((b_gain, g_gain, r_gain)):
+                gained = np.clip(ramp * gain, 0, 255).astype(np.uint8)
+                lut[:, 0, c] = np.clip(gamma_lut[gained] + brightness,
+                                       0, 255).astype(np.uint8)
+            self._cc_lut_cache = (key, lut)
+        return self._cc_lut_cache[1]
 
     def apply_color_correction(self, img, r_gain=1.0, g_gain=1.0, b_gain=1.0,
                                 gamma=1.0, saturation=1.0, brightness=0):
@@ -297,39 +567,48 @@ class ImageDecoder:
             saturation: Color saturation (0.0-2.0, 1.0=no change)
             brightness: Brightness adjustment (-50 to +50)
         """
-        # Convert to float for processing
-        img_float = img.astype(np.float32)
-
-        # Apply white balance (BGR order in OpenCV)
-        img_float[:, :, 0] *= b_gain  # Blue
-        img_float[:, :, 1] *= g_gain  # Green
-        img_float[:, :, 2] *= r_gain  # Red
-
-        # Clip and convert back
-        img_float = np.clip(img_float, 0, 255)
-
-        # Apply gamma correction
-        if gamma != 1.0:
-            img_float = 255.0 * np.power(img_float / 255.0, 1.0 / gamma)
-
-        # Apply brightness
-        if brightness != 0:
-            img_float = img_float + brightness
-            img_float = np.clip(img_float, 0, 255)
-
-        img_corrected = img_float.astype(np.uint8)
-
-        # Apply saturation in HSV space
+        # All sliders at neutral: correction is the identity, skip the pass
+        if (r_gain == 1.0 and g_gain == 1.0 and b_gain == 1.0 and
+                gamma == 1.0 and saturation == 1.0 and brightness == 0):
+            return img
+
+        if HAVE_NUMBA:
+            # Single fused pass, including saturation (no HSV round-trip)
+            out = self._scratch('corr', img.shape, img.dtype)
+            _color_correct(img, out, b_gain, g_gain, r_gain,
+                           self._get_gamma_lut(gamma), float(brightness),
+                           saturation)
+            return out
+
+        # White balance + gamma + brightness fused into one per-channel
+        # table lookup: stays in uint8 and avoids the float32 temporaries.
+        # Skipped entirely when only saturation is adjusted
+        img_corrected = img
+        if (r_gain != 1.0 or g_gain != 1.0 or b_gain != 1.0 or
+                gamma != 1.0 or brightness != 0):
+            lut3 = self._get_cc_lut(b_gain, g_gain, r_gain, gamma, brightness)
+            img_corrected = cv2.LUT(img, lut3,
+                                    dst=self._scratch('corr', img.shape, img.dtype))
+
+        # Apply saturation in HSV space; the S channel is scaled with a
+        # saturating uint8 multiply in pooled buffers - no float32
+        # round-trip and no per-frame allocations
         if saturation != 1.0:
-            hsv = cv2.cvtColor(img_corrected, cv2.COLOR_BGR2HSV).astype(np.float32)
-            hsv[:, :, 1] *= saturation  # Saturation channel
-            hsv[:, :, 1] = np.clip(hsv[:, :, 1], 0, 255)
-            img_corrected = cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+            h, w = img_corrected.shape[:2]
+            hsv = cv2.cvtColor(img_corrected, cv2.COLOR_BGR2HSV,
+                               dst=self._scratch('hsv', (h, w, 3), np.uint8))
+            s = cv2.extractChannel(hsv, 1,
+                                   dst=self._scratch('hsv_s', (h, w), np.uint8))
+            cv2.convertScaleAbs(s, dst=s, alpha=saturation)
+            cv2.insertChannel(s, hsv, 1)
+            img_corrected = cv2.cvtColor(
+                hsv, cv2.COLOR_HSV2BGR,
+                dst=self._scratch('sat_bgr', (h, w, 3), np.uint8))
 
         return img_corrected
 
     def process_frame(self, raw_data, enhance=True, pattern='RG', rotate=0,
-                      color_correction=None):
+                      color_correction=None, preview_size=None):
         """Full processing pipeline: RAW -> RGB or pass-through for ISP-processed RGB
 
         Args:
@@ -339,73 +618,130 @@ class ImageDecoder:
             rotate: Rotation (0, 90, 180, 270)
             color_correction: Dict with r_gain, g_gain, b_gain, gamma, saturation, brightness
                               (only applied to RAW formats, RGB888 already has ISP corrections)
+            preview_size: Optional (width, height) - downsample right after
+                          decode/debayer so correction, CLAHE and rotation run
+                          at display resolution; pass None for full quality
         """
-        # Auto-detect and decode format
-        result = self.auto_decode(raw_data)
-        if result is None or result[0] is None:
-            return None
-
-        image, format_type = result
-
-        if format_type == 'rgb':
-            # RGB888/RGB565 from ISP - demosaic done, but CCM/AWB may not be configured
-            rgb = image
-
-            # Debug: print image info for first frame only
-            if not hasattr(self, '_debug_printed'):
-                self._debug_printed = True
-                print(f"RGB image from ISP: {rgb.shape}, dtype={rgb.dtype}")
-                print(f"  Stats: min={rgb.min()}, max={rgb.max()}, mean={rgb.mean():.1f}")
-                print("  NOTE: ISP CCM/AWB not configured - applying Python color correction")
-
-            # Apply color correction (ISP CCM not configured, so we do it here)
-            if color_correction:
-                rgb = self.apply_color_correction(
-                    rgb,
-                    r_gain=color_correction.get('r_gain', 1.0),
-                    g_gain=color_correction.get('g_gain', 1.0),
-                    b_gain=color_correction.get('b_gain', 1.0),
-                    gamma=color_correction.get('gamma', 1.0),
-                    saturation=color_correction.get('saturation', 1.0),
-                    brightness=color_correction.get('brightness', 0)
-                )
-
+        # Fold the 180-degree orientation fix into the RAW10 unpack where
+        # possible: the kernel mirrors its write indices for free, making
+        # the later full-image rotate pass unnecessary. Only engages once
+        # the format is known to be packed RAW10
+        self._fold_rot180 = (HAVE_NUMBA and rotate == 180 and
+                             getattr(self, '_cached_format', None) == 'packed')
+        self._unpack_rotated = False
+
+        # For preview-sized output, debayer RAW formats with the binned
+        # 2x2 kernel - one quarter-resolution pass instead of full
+        # demosaic + downscale
+        use_binned = (HAVE_NUMBA and preview_size is not None and
+                      getattr(self, '_cached_format', None)
+                      in ('raw8', 'packed', 'raw16'))
+
+        # Reuse the decoded/debayered image when the same raw frame is
+        # reprocessed (e.g. a trackbar moved): decode and debayer are the
+        # most expensive stages and their result only depends on the raw
+        # bytes, the Bayer pattern and the folded rotation/binning
+        (cached_raw, cached_pattern, cached_img,
+         cached_fmt, cached_rotated, cached_binned) = self._decode_cache
+        if (raw_data is cached_raw and cached_rotated == self._fold_rot180 and
+                cached_binned == use_binned and
+                (cached_fmt == 'rgb' or pattern == cached_pattern)):
+            rgb = cached_img
+            format_type = cached_fmt
+            self._unpack_rotated = cached_rotated
         else:
-            # RAW format - needs debayering and color correction
-            bayer = image
-
-            # Debug: print min/max pixel values for first frame only
-            if not hasattr(self, '_debug_printed'):
-                self._debug_printed = True
-                bayer_min, bayer_max, bayer_mean = bayer.min(), bayer.max(), bayer.mean()
-                print(f"Bayer stats: min={bayer_min}, max={bayer_max}, mean={bayer_mean:.1f}")
-                if bayer_max > 900:
-                    print("WARNING: Image may be overexposed (max > 900 on 10-bit scale)")
-
-            rgb = self.debayer_rggb(bayer, pattern)
-
-            # Apply color correction before CLAHE (if specified) - only for RAW
-            if color_correction:
-                rgb = self.apply_color_correction(
-                    rgb,
-                    r_gain=color_correction.get('r_gain', 1.0),
-                    g_gain=color_correction.get('g_gain', 1.0),
-                    b_gain=color_correction.get('b_gain', 1.0),
-                    gamma=color_correction.get('gamma', 1.0),
-                    saturation=color_correction.get('saturation', 1.0),
-                    brightness=color_correction.get('brightness', 0)
-                )
-
-            if enhance:
-                rgb = self.enhance_image(rgb)
-
-        # Apply rotation (for all formats)
+            # Auto-detect and decode format
+            result = self.auto_decode(raw_data)
+            if result is None or result[0] is None:
+                return None
+
+            image, format_type = result
+
+            if format_type == 'rgb':
+                # RGB888/RGB565 from ISP - demosaic done, but CCM/AWB may not be configured
+                rgb = image
+
+                # Debug: print image info for first frame only
+                if not self._debug_printed:
+                    self._debug_printed = True
+                    print(f"RGB image from ISP: {rgb.shape}, dtype={rgb.dtype}")
+                    print(f"  Stats: min={rgb.min()}, max={rgb.max()}, mean={rgb.mean():.1f}")
+                    print("  NOTE: ISP CCM/AWB not configured - applying Python color correction")
+            else:
+                # RAW format - needs debayering and color correction
+                bayer = image
+
+                # Debug: print min/max pixel values for first frame only
+                if not self._debug_printed:
+                    self._debug_printed = True
+                    bayer_min, bayer_max, bayer_mean = bayer.min(), bayer.max(), bayer.mean()
+                    print(f"Bayer stats: min={bayer_min}, max={bayer_max}, mean={bayer_mean:.1f}")
+                    if bayer_max > 900:
+                        print("WARNING: Image may be overexposed (max > 900 on 10-bit scale)")
+
+                bayer_pattern = pattern
+                if self._unpack_rotated:
+                    # The mirrored unpack rotated the mosaic too:
+                    # RGGB<->BGGR and GRBG<->GBRG swap places
+                    bayer_pattern = {'RG': 'BG', 'BG': 'RG',
+                                     'GR': 'GB', 'GB': 'GR'}[pattern]
+                if use_binned:
+                    rgb = self.debayer_binned(bayer, bayer_pattern)
+                else:
+                    rgb = self.debayer_rggb(bayer, bayer_pattern)
+
+            self._decode_cache = (raw_data, pattern, rgb, format_type,
+                                  self._unpack_rotated, use_binned)
+
+        if preview_size:
+            # The window shows ~half resolution anyway; shrinking here makes
+            # every later stage pay for preview pixels, not sensor pixels
+            # (no-op when the binned debayer already produced this size)
+            pw, ph = preview_size
+            if rgb.shape[0] != ph or rgb.shape[1] != pw:
+                rgb = cv2.resize(rgb, (pw, ph),
+                                 dst=self._scratch('preview', (ph, pw, 3), np.uint8),
+                                 interpolation=cv2.INTER_AREA)
+
+        # Apply color correction (ISP CCM not configured, so we do it here;
+        # for RAW it runs before CLAHE). Writes into its own buffer, so the
+        # cached image above stays intact
+        if color_correction:
+            rgb = self.apply_color_correction(
+                rgb,
+                r_gain=color_correction.get('r_gain', 1.0),
+                g_gain=color_correction.get('g_gain', 1.0),
+                b_gain=color_correction.get('b_gain', 1.0),
+                gamma=color_correction.get('gamma', 1.0),
+                saturation=color_correction.get('saturation', 1.0),
+                brightness=color_correction.get('brightness', 0)
+            )
+
+        if format_type != 'rgb' and enhance:
+            rgb = self.enhance_image(rgb)
+
+        # Apply rotation (for all formats) into pooled buffers instead of
+        # letting cv2.rotate allocate a fresh image; 180 degrees (the
+        # default orientation fix) is a single flip pass
+        h, w = rgb.shape[:2]
         if rotate == 90:
-            rgb = cv2.rotate(rgb, cv2.ROTATE_90_CLOCKWISE)
-        elif rotate == 180:
-            rgb = cv2.rotate(rgb, cv2.ROTATE_180)
+            rgb = cv2.rotate(rgb, cv2.ROTATE_90_CLOCKWISE,
+                             dst=self._scratch('rot', (w, h, 3), np.uint8))
+        elif rotate == 180 and not self._unpack_rotated:
+            rgb = cv2.flip(rgb, -1,
+                           dst=self._scratch('rot', (h, w, 3), np.uint8))
         elif rotate == 270:
-            rgb = cv2.rotate(rgb, cv2.ROTATE_90_COUNTERCLOCKWISE)
+            rgb = cv2.rotate(rgb, cv2.ROTATE_90_COUNTERCLOCKWISE,
+                             dst=self._scratch('rot', (w, h, 3), np.uint8))
+
+        if rgb is self._decode_cache[2]:
+            # No stage above produced a fresh buffer, so this is still the
+            # cached decode output (or the read-only RGB888 alias of the
+            # input). Callers draw overlays on the result - hand back a
+            # working copy so that never burns into the cache
+            out = self._scratch('display', rgb.shape, np.uint8)
+            np.copyto(out, rgb)
+            rgb = out
 
         return rgb
 
@@ -417,12 +753,24 @@ class RawStreamViewer:
         self.host = host
         self.port = port
         self.decoder = ImageDecoder(width, height)
-        self.frame_queue = Queue(maxsize=2)  # Small queue for low latency
+        # Single newest-frame slot: the receiver overwrites it, the display
+        # swaps it out. Gives "keep only the latest" without queue
+        # mutex/condvar traffic or drain loops on either side
+        self._latest_raw = None
+        self._slot_lock = threading.Lock()
         self.running = False
         self.fps = 0
         self.frame_count = 0
         self.last_frame = None  # Keep last frame to avoid "waiting" screen
         self.dropped_frames = 0  # Count dropped frames for stats
+        # Saves (JPEG encode + disk writes) run here so they never stall
+        # the display loop
+        self._save_pool = ThreadPoolExecutor(max_workers=2)
+        # One keep-alive session so reconnects reuse the TCP flow to the
+        # ESP32 instead of building a fresh connection each time
+        self._session = requests.Session()
+        self._session.mount('http://', requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=2, max_retries=0))
 
     def receiver_thread(self):
         """Background thread using continuous streaming"""
@@ -446,37 +794,53 @@ class RawStreamViewer:
             try:
                 print(f"Connecting to stream: {url}")
                 print(f"LOW LATENCY MODE: Dropping old frames, max buffer {max_buffer_size} bytes")
-                response = requests.get(url, stream=True, timeout=10)
-                buffer = b''
+                response = self._session.get(url, stream=True, timeout=10)
+                # Growable parse buffer with a scan cursor - chunks are
+                # appended in place and boundaries found with buf.find(),
+                # so nothing is recopied per chunk
+                buf = bytearray()
+                scan_pos = 0
                 total_received = 0
 
-                for chunk in response.iter_content(chunk_size=131072):  # Larger chunks for speed
-                    if not self.running:
+                # Read straight into a reusable 128 KB buffer; iter_content
+                # would allocate a fresh bytes object for every chunk
+                chunk_buf = bytearray(131072)
+                chunk_view = memoryview(chunk_buf)
+
+                while self.running:
+                    n = response.raw.readinto(chunk_view)
+                    if n <= 0:
                         break
 
-                    buffer += chunk
-                    total_received += len(chunk)
+                    buf += chunk_view[:n]
+                    total_received += n
 
                     # LOW LATENCY: If buffer gets too large, keep only the end
-                    if len(buffer) > max_buffer_size:
+                    if len(buf) > max_buffer_size:
                         # Find last boundary and keep from there
-                        last_boundary = buffer.rfind(boundary)
+                        last_boundary = buf.rfind(boundary)
                         if last_boundary > 0:
-                            buffer = buffer[last_boundary:]
-                            print(f"Buffer overflow - trimmed to {len(buffer)} bytes")
+                            del buf[:last_boundary]
+                            scan_pos = 0
+                            print(f"Buffer overflow - trimmed to {len(buf)} bytes")
 
                     # Look for frame boundaries
-                    while boundary in buffer:
-                        parts = buffer.split(boundary, 1)
-                        frame_data = parts[0]
-                        buffer = parts[1] if len(parts) > 1 else b''
+                    while True:
+                        idx = buf.find(boundary, scan_pos)
+                        if idx < 0:
+                            # Remember where to resume so earlier bytes are
+                            # never rescanned (keep a tail in case a boundary
+                            # straddles two chunks)
+                            scan_pos = max(0, len(buf) - len(boundary) + 1)
+                            break
 
                         # Extract binary data (skip headers)
-                        if b'\r\n\r\n' in frame_data:
-                            _, data = frame_data.split(b'\r\n\r\n', 1)
+                        header_end = buf.find(b'\r\n\r\n', 0, idx)
+                        if header_end >= 0:
+                            start = header_end + 4
                             # Don't strip - raw data might end with \r\n
 
-                            data_len = len(data)
+                            data_len = idx - start
                             # Accept any valid frame size (RGB888, RGB565, RAW8)
                             valid_sizes = [
                                 self.decoder.frame_size_rgb888,
@@ -497,18 +861,15 @@ class RawStreamViewer:
                                     print(f"  Matched format size: {matched_size} bytes")
 
                             if matched_size and data_len >= matched_size:
-                                # LOW LATENCY: Clear ALL old frames, keep only newest
-                                dropped = 0
-                                while not self.frame_queue.empty():
-                                    try:
-                                        self.frame_queue.get_nowait()
-                                        dropped += 1
-                                    except:
-                                        break
-                                self.dropped_frames += dropped
-
-                                # Put the newest frame
-                                self.frame_queue.put(data[:matched_size])
+                                # Single copy out of the parse buffer
+                                data = bytes(memoryview(buf)[start:start + matched_size])
+
+                                # LOW LATENCY: overwrite the slot - an
+                                # unconsumed frame is simply dropped
+                                with self._slot_lock:
+                                    if self._latest_raw is not None:
+                                        self.dropped_frames += 1
+                                    self._latest_raw = data
 
                                 frame_count += 1
                                 current_time = time.time()
@@ -521,10 +882,46 @@ class RawStreamViewer:
                             elif data_len > 1000:  # Ignore tiny fragments
                                 print(f"Unknown frame size: {data_len} bytes")
 
+                        # Consume this frame (and its boundary marker)
+                        del buf[:idx + len(boundary)]
+                        scan_pos = 0
+
             except Exception as e:
                 print(f"Stream error: {e}, reconnecting...")
                 time.sleep(0.5)
 
+    def _save_frame(self, frame, raw_data, settings, frame_num):
+        """Write JPG, raw dump and settings file (runs on the save pool)"""
+        filename = (f"frame_{frame_num:04d}"
+                    f"_R{int(settings['r_gain'] * 100)}"
+                    f"_G{int(settings['g_gain'] * 100)}"
+                    f"_B{int(settings['b_gain'] * 100)}.jpg")
+        ok, jpg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        if ok:
+            with open(filename, 'wb') as f:
+                f.write(jpg)
+            print(f"Saved: {filename}")
+        else:
+            print(f"JPEG encode failed for {filename}")
+        if raw_data is not None:
+            raw_filename = f"frame_{frame_num:04d}.raw"
+            with open(raw_filename, 'wb') as f:
+                f.write(raw_data)
+            print(f"Saved: {raw_filename}")
+        # Also save color correction settings
+        settings_file = f"frame_{frame_num:04d}_settings.txt"
+        with open(settings_file, 'w') as f:
+            f.write(f"R_Gain: {settings['r_gain']:.3f}\n")
+            f.write(f"G_Gain: {settings['g_gain']:.3f}\n")
+            f.write(f"B_Gain: {settings['b_gain']:.3f}\n")
+            f.write(f"Gamma: {settings['gamma']:.3f}\n")
+            f.write(f"Saturation: {settings['saturation']:.3f}\n")
+            f.write(f"Brightness: {settings['brightness']}\n")
+            f.write(f"Pattern: {settings['pattern']}\n")
+            f.write(f"Rotation: {settings['rotation']}\n")
+            f.write(f"CLAHE: {'ON' if settings['enhance'] else 'OFF'}\n")
+        print(f"Saved settings: {settings_file}")
+
     def run(self, enhance=True, save_frames=False):
         """Main display loop with interactive color correction controls"""
         self.running = True
@@ -549,9 +946,12 @@ class RawStreamViewer:
             'brightness': 100,  # Brightness offset (100 = 0)
         }
 
-        # Trackbar callback (does nothing, we read values in loop)
-        def nothing(x):
-            pass
+        # Trackbar callbacks push values into color_params, so the loop
+        # reads a dict instead of six HighGUI round-trips per iteration
+        def on_trackbar(name):
+            def update(value):
+                color_params[name] = value
+            return update
 
         # Start receiver thread
         receiver = threading.Thread(target=self.receiver_thread, daemon=True)
@@ -591,12 +991,12 @@ class RawStreamViewer:
         cv2.resizeWindow('Color Correction', 400, 300)
 
         # Create trackbars (0-200 range for 0.0-2.0 multipliers)
-        cv2.createTrackbar('R Gain', 'Color Correction', color_params['r_gain'], 200, nothing)
-        cv2.createTrackbar('G Gain', 'Color Correction', color_params['g_gain'], 200, nothing)
-        cv2.createTrackbar('B Gain', 'Color Correction', color_params['b_gain'], 200, nothing)
-        cv2.createTrackbar('Gamma', 'Color Correction', color_params['gamma'], 200, nothing)
-        cv2.createTrackbar('Saturation', 'Color Correction', color_params['saturation'], 200, nothing)
-        cv2.createTrackbar('Brightness', 'Color Correction', color_params['brightness'], 200, nothing)
+        cv2.createTrackbar('R Gain', 'Color Correction', color_params['r_gain'], 200, on_trackbar('r_gain'))
+        cv2.createTrackbar('G Gain', 'Color Correction', color_params['g_gain'], 200, on_trackbar('g_gain'))
+        cv2.createTrackbar('B Gain', 'Color Correction', color_params['b_gain'], 200, on_trackbar('b_gain'))
+        cv2.createTrackbar('Gamma', 'Color Correction', color_params['gamma'], 200, on_trackbar('gamma'))
+        cv2.createTrackbar('Saturation', 'Color Correction', color_params['saturation'], 200, on_trackbar('saturation'))
+        cv2.createTrackbar('Brightness', 'Color Correction', color_params['brightness'], 200, on_trackbar('brightness'))
 
         # Preset: fix green tint for IMX662 (sensor has strong green response)
         # These values compensate for missing ISP CCM configuration
@@ -609,15 +1009,20 @@ class RawStreamViewer:
         frame_num = 0
         last_raw_data = None
         last_displayed_frame = None
+        last_params_key = None
+
+        # Process at half resolution for display (the window is 960x550);
+        # saving re-runs the pipeline at full sensor resolution
+        preview_size = (self.decoder.width // 2, self.decoder.height // 2)
 
         while self.running:
-            # Read trackbar values
-            r_gain = cv2.getTrackbarPos('R Gain', 'Color Correction') / 100.0
-            g_gain = cv2.getTrackbarPos('G Gain', 'Color Correction') / 100.0
-            b_gain = cv2.getTrackbarPos('B Gain', 'Color Correction') / 100.0
-            gamma = max(0.1, cv2.getTrackbarPos('Gamma', 'Color Correction') / 100.0)
-            saturation = cv2.getTrackbarPos('Saturation', 'Color Correction') / 100.0
-            brightness = cv2.getTrackbarPos('Brightness', 'Color Correction') - 100  # -100 to +100
+            # Read slider values cached by the trackbar callbacks
+            r_gain = color_params['r_gain'] / 100.0
+            g_gain = color_params['g_gain'] / 100.0
+            b_gain = color_params['b_gain'] / 100.0
+            gamma = max(0.1, color_params['gamma'] / 100.0)
+            saturation = color_params['saturation'] / 100.0
+            brightness = color_params['brightness'] - 100  # -100 to +100
 
             color_correction = {
                 'r_gain': r_gain,
@@ -628,33 +1033,37 @@ class RawStreamViewer:
                 'brightness': brightness
             }
 
-            # LOW LATENCY: Get the NEWEST frame, discard any older ones
-            raw_data = None
-            frames_in_queue = 0
-            while True:
-                try:
-                    raw_data = self.frame_queue.get_nowait()
-                    frames_in_queue += 1
-                except:
-                    break  # Queue empty
+            # LOW LATENCY: swap the newest frame out of the slot (None if
+            # nothing new arrived since last iteration)
+            with self._slot_lock:
+                raw_data = self._latest_raw
+                self._latest_raw = None
             if raw_data is not None:
                 last_raw_data = raw_data
 
             current_pattern = patterns[pattern_idx]
             current_rotation = rotations[rotation_idx]
 
-            # Process new frame if available
-            if raw_data is not None:
+            # Reprocess only when a new frame arrived OR a control changed;
+            # otherwise the loop just polls keys at waitKey cadence without
+            # burning CPU on identical work
+            params_key = (r_gain, g_gain, b_gain, gamma, saturation,
+                          brightness, current_pattern, current_rotation, enhance)
+            if last_raw_data is not None and (raw_data is not None or
+                                              params_key != last_params_key):
                 frame = self.decoder.process_frame(
-                    raw_data,
+                    last_raw_data,
                     enhance=enhance,
                     pattern=current_pattern,
                     rotate=current_rotation,
-                    color_correction=color_correction
+                    color_correction=color_correction,
+                    preview_size=preview_size
                 )
+                last_params_key = params_key
                 if frame is not None:
                     last_displayed_frame = frame.copy()
-                    frame_num += 1
+                    if raw_data is not None:
+                        frame_num += 1
 
             # Display frame (new or last)
             if last_displayed_frame is not None:
@@ -678,28 +1087,36 @@ class RawStreamViewer:
             if key == ord('q'):
                 break
             elif key == ord('s') and last_displayed_frame is not None:
-                # Save current frame with color correction values in filename
-                filename = f"frame_{frame_num:04d}_R{int(r_gain*100)}_G{int(g_gain*100)}_B{int(b_gain*100)}.jpg"
-                cv2.imwrite(filename, last_displayed_frame)
-                print(f"Saved: {filename}")
+                # Snapshot frame + settings and save in the background so
+                # the JPEG encode and disk writes don't stall the display
+                settings = {
+                    'r_gain': r_gain,
+                    'g_gain': g_gain,
+                    'b_gain': b_gain,
+                    'gamma': gamma,
+                    'saturation': saturation,
+                    'brightness': brightness,
+                    'pattern': current_pattern,
+                    'rotation': current_rotation,
+                    'enhance': enhance,
+                }
+                # Re-run the pipeline at full resolution for the file (the
+                # preview is half-res); decode is cached so only the
+                # correction stages repeat. Runs here rather than on the
+                # save pool because the decoder's buffers aren't shared
+                # safely across threads - only the encode/writes go async
                 if last_raw_data is not None:
-                    raw_filename = f"frame_{frame_num:04d}.raw"
-                    with open(raw_filename, 'wb') as f:
-                        f.write(last_raw_data)
-                    print(f"Saved: {raw_filename}")
-                # Also save color correction settings
-                settings_file = f"frame_{frame_num:04d}_settings.txt"
-                with open(settings_file, 'w') as f:
-                    f.write(f"R_Gain: {r_gain:.3f}\n")
-                    f.write(f"G_Gain: {g_gain:.3f}\n")
-                    f.write(f"B_Gain: {b_gain:.3f}\n")
-                    f.write(f"Gamma: {gamma:.3f}\n")
-                    f.write(f"Saturation: {saturation:.3f}\n")
-                    f.write(f"Brightness: {brightness}\n")
-                    f.write(f"Pattern: {current_pattern}\n")
-                    f.write(f"Rotation: {current_rotation}\n")
-                    f.write(f"CLAHE: {'ON' if enhance else 'OFF'}\n")
-                print(f"Saved settings: {settings_file}")
+                    save_frame = self.decoder.process_frame(
+                        last_raw_data,
+                        enhance=enhance,
+                        pattern=current_pattern,
+                        rotate=current_rotation,
+                        color_correction=color_correction
+                    )
+                else:
+                    save_frame = last_displayed_frame
+                self._save_pool.submit(self._save_frame, save_frame.copy(),
+                                       last_raw_data, settings, frame_num)
             elif key == ord('e'):
                 enhance = not enhance
                 print(f"Enhancement: {'ON' if enhance else 'OFF'}")
@@ -745,6 +1162,7 @@ class RawStreamViewer:
                 print("Applied neutral daylight preset (R:1.2 G:0.85 B:1.15)")
 
         self.running = False
+        self._save_pool.shutdown(wait=True)  # Flush any pending saves
         cv2.destroyAllWindows()
         print("Viewer closed.")
 
@@ -754,8 +1172,10 @@ def test_with_file(filename, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT):
     decoder = ImageDecoder(width, height)
 
     print(f"\nLoading: {filename}")
+    # mmap instead of read(): zero-copy from the page cache, np.frombuffer
+    # in the decoder aliases the mapping directly
     with open(filename, 'rb') as f:
-        raw_data = f.read()
+        raw_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
     print(f"File size: {len(raw_data)} bytes")
     print(f"Expected RAW10 packed: {decoder.frame_size_packed} bytes")
@@ -13,7 +13,13 @@ import argparse
 import requests
 import time
 import threading
-from queue import Queue
+
+# Optional Numba JIT for the decode kernel (falls back to OpenCV)
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
 # IMX662 sensor configuration
 DEFAULT_WIDTH = 1936
@@ -22,6 +28,35 @@ DEFAULT_HEIGHT = 1100
 # RGB565: 2 bytes per pixel
 BYTES_PER_PIXEL = 2
 
+if HAVE_NUMBA:
+    @njit(parallel=True, cache=True, boundscheck=False, nogil=True)
+    def _decode_rotate(rgb565, out, rotation):
+        """Fused RGB565 unpack + rotate (0/90/180/270 clockwise)
+
+        One pass over the source writes directly to the display-oriented
+        output; low bits are replicated so full-scale values reach 255.
+        Values are widened to uint32 before shifting - uint16 shifts
+        overflow silently in Numba.
+        """
+        height, width = rgb565.shape
+        for y in prange(height):
+            for x in range(width):
+                v = np.uint32(rgb565[y, x])
+                r = ((v >> 8) & 0xF8) | (v >> 13)
+                g = ((v >> 3) & 0xFC) | ((v >> 9) & 0x03)
+                b = ((v << 3) & 0xF8) | ((v >> 2) & 0x07)
+                if rotation == 90:
+                    dy, dx = x, height - 1 - y
+                elif rotation == 180:
+                    dy, dx = height - 1 - y, width - 1 - x
+                elif rotation == 270:
+                    dy, dx = width - 1 - x, y
+                else:
+                    dy, dx = y, x
+                out[dy, dx, 0] = b
+                out[dy, dx, 1] = g
+                out[dy, dx, 2] = r
+
 
 class RGB565Decoder:
     """Decode RGB565 data from ESP32-P4 ISP"""
@@ -30,6 +65,40 @@ class RGB565Decoder:
         self.width = width
         self.height = height
         self.frame_size = width * height * BYTES_PER_PIXEL
+        # Reused BGR output buffer - avoids a ~6 MB allocation per frame
+        self._bgr_buf = np.empty((height, width, 3), dtype=np.uint8)
+        # Full RGB565->BGR table: only 2^16 input values exist, so the
+        # whole per-pixel computation collapses to one 3-byte lookup
+        # (192 KB, L2-resident) with the same low-bit replication as the
+        # Numba kernel
+        v = np.arange(65536, dtype=np.uint32)
+        self._lut = np.empty((65536, 3), dtype=np.uint8)
+        self._lut[:, 0] = ((v << 3) & 0xF8) | ((v >> 2) & 0x07)
+        self._lut[:, 1] = ((v >> 3) & 0xFC) | ((v >> 9) & 0x03)
+        self._lut[:, 2] = ((v >> 8) & 0xF8) | (v >> 13)
+        # Half-resolution outputs for the display path: the window is
+        # ~half the sensor size anyway, so decoding a stride-2 subsample
+        # quarters the work; saves still decode full resolution. Two
+        # buffers per orientation, toggled each decode, so the decoder
+        # never overwrites the frame the display is holding
+        self._bgr_half = [np.empty((height // 2, width // 2, 3), dtype=np.uint8)
+                          for _ in range(2)]
+        self._bgr_half_rot = [np.empty((width // 2, height // 2, 3), dtype=np.uint8)
+                              for _ in range(2)]
+        self._half_idx = 0
+        if HAVE_NUMBA:
+            # Second buffer for 90/270 output plus a tiny warm-up call so
+            # the first real frame doesn't pay the JIT cost
+            self._bgr_rot = np.empty((width, height, 3), dtype=np.uint8)
+            _decode_rotate(np.zeros((1, 1), np.uint16),
+                           np.empty((1, 1, 3), np.uint8), 0)
+        else:
+            # Fallback-path buffers: rotated uint16 planes (rotation done
+            # before BGR expansion moves 2 bytes/px instead of 3) and the
+            # 90/270-oriented BGR output
+            self._rot565 = np.empty((width, height), dtype=np.uint16)
+            self._rot565_180 = np.empty((height, width), dtype=np.uint16)
+            self._bgr_rot = np.empty((width, height, 3), dtype=np.uint8)
         print(f"Decoder initialized: {width}x{height}")
         print(f"  RGB565 frame size: {self.frame_size} bytes")
 
@@ -39,43 +108,77 @@ class RGB565Decoder:
             print(f"Warning: Expected {self.frame_size} bytes, got {len(raw_data)}")
             return None
 
-        # Take exact frame size
-        raw_data = raw_data[:self.frame_size]
-
         # Convert to numpy array (16-bit little-endian)
-        rgb565 = np.frombuffer(raw_data, dtype=np.uint16).reshape((self.height, self.width))
-
-        # Extract RGB components
-        # RGB565: RRRRRGGGGGGBBBBB (5-6-5 bits)
-        r = ((rgb565 >> 11) & 0x1F).astype(np.uint8)  # 5 bits
-        g = ((rgb565 >> 5) & 0x3F).astype(np.uint8)   # 6 bits
-        b = (rgb565 & 0x1F).astype(np.uint8)          # 5 bits
-
-        # Scale to 8-bit
-        r = (r << 3) | (r >> 2)  # 5-bit to 8-bit
-        g = (g << 2) | (g >> 4)  # 6-bit to 8-bit
-        b = (b << 3) | (b >> 2)  # 5-bit to 8-bit
-
-        # Create BGR image for OpenCV
-        bgr = np.stack([b, g, r], axis=-1)
-
-        return bgr
-
-    def process_frame(self, raw_data, rotate=0):
-        """Process frame with optional rotation"""
-        bgr = self.decode_rgb565(raw_data)
-        if bgr is None:
+        rgb565 = np.frombuffer(raw_data, dtype=np.uint16,
+                               count=self.width * self.height)
+        rgb565 = rgb565.reshape((self.height, self.width))
+
+        # Single gather through the table - no arithmetic, no temporaries
+        np.take(self._lut, rgb565, axis=0, out=self._bgr_buf)
+        return self._bgr_buf
+
+    def _next_half_buf(self, rotate):
+        """Pick the next display output buffer, alternating the pair"""
+        pair = self._bgr_half_rot if rotate in (90, 270) else self._bgr_half
+        buf = pair[self._half_idx]
+        self._half_idx ^= 1
+        return buf
+
+    def process_frame(self, raw_data, rotate=0, half=False):
+        """Process frame with optional rotation
+
+        half=True decodes a stride-2 subsample into the quarter-size
+        display buffers. Full and half decodes use disjoint outputs, so
+        a full-resolution save can run alongside the display decode.
+        """
+        if len(raw_data) < self.frame_size:
+            print(f"Warning: Expected {self.frame_size} bytes, got {len(raw_data)}")
             return None
 
-        # Apply rotation
+        rgb565 = np.frombuffer(raw_data, dtype=np.uint16,
+                               count=self.width * self.height)
+        rgb565 = rgb565.reshape((self.height, self.width))
+        if half:
+            rgb565 = rgb565[::2, ::2]
+
+        if HAVE_NUMBA:
+            # Decode and rotate fused in one pass, written directly into
+            # the output oriented for display
+            if half:
+                out = self._next_half_buf(rotate)
+            else:
+                out = self._bgr_rot if rotate in (90, 270) else self._bgr_buf
+            _decode_rotate(rgb565, out, rotate)
+            return out
+
+        if half:
+            # On the subsampled view rotation is free (np.rot90 returns a
+            # view); the gather writes the oriented output directly
+            if rotate == 90:
+                rgb565 = np.rot90(rgb565, -1)
+            elif rotate == 180:
+                rgb565 = np.rot90(rgb565, 2)
+            elif rotate == 270:
+                rgb565 = np.rot90(rgb565, 1)
+            dst = self._next_half_buf(rotate)
+            np.take(self._lut, rgb565, axis=0, out=dst)
+            return dst
+
+        # Rotate the 2-byte plane before expanding it to 3-byte BGR, so
+        # the rotation pass moves a third less memory
         if rotate == 90:
-            bgr = cv2.rotate(bgr, cv2.ROTATE_90_CLOCKWISE)
+            rgb565 = cv2.rotate(rgb565, cv2.ROTATE_90_CLOCKWISE,
+                                dst=self._rot565)
         elif rotate == 180:
-            bgr = cv2.rotate(bgr, cv2.ROTATE_180)
+            rgb565 = cv2.rotate(rgb565, cv2.ROTATE_180,
+                                dst=self._rot565_180)
         elif rotate == 270:
-            bgr = cv2.rotate(bgr, cv2.ROTATE_90_COUNTERCLOCKWISE)
+            rgb565 = cv2.rotate(rgb565, cv2.ROTATE_90_COUNTERCLOCKWISE,
+                                dst=self._rot565)
 
-        return bgr
+        dst = self._bgr_rot if rotate in (90, 270) else self._bgr_buf
+        np.take(self._lut, rgb565, axis=0, out=dst)
+        return dst
 
 
 class RGB565StreamViewer:
@@ -85,7 +188,22 @@ class RGB565StreamViewer:
         self.host = host
         self.port = port
         self.decoder = RGB565Decoder(width, height)
-        self.frame_queue = Queue(maxsize=8)
+        # Single newest-frame slots: each producer overwrites its slot and
+        # signals the event; stale frames drop naturally with no queue
+        # locking (slot assignment is atomic under the GIL)
+        self._latest_raw = None
+        self._frame_ready = threading.Event()
+        # Ring of reusable frame buffers: receiving into recycled storage
+        # keeps ~4 MB/frame out of the allocator and the live frames warm
+        # in cache; four slots give the decoder ample time to consume a
+        # frame before its buffer is rewritten
+        self._raw_bufs = [bytearray(self.decoder.frame_size) for _ in range(4)]
+        self._raw_idx = 0
+        # Decoded-frame slot fed by the decoder thread; the display loop
+        # only consumes finished BGR frames
+        self._latest_bgr = None
+        self._bgr_ready = threading.Event()
+        self._rotation = 180
         self.running = False
         self.fps = 0
         self.last_frame = None
@@ -105,32 +223,48 @@ class RGB565StreamViewer:
             try:
                 print(f"Connecting to stream: {url}")
                 response = requests.get(url, stream=True, timeout=10)
-                buffer = b''
-
-                for chunk in response.iter_content(chunk_size=65536):
-                    if not self.running:
+                # bytearray with a scan cursor: chunks append in place and
+                # find() runs at C speed from where the last scan stopped,
+                # instead of rebuilding the buffer per chunk
+                buf = bytearray()
+                scan_pos = 0
+
+                raw = response.raw
+                raw.decode_content = False
+
+                while self.running:
+                    # ~1/4 frame per read: a frame reassembles in a few
+                    # reads instead of ~65 iter_content callbacks
+                    chunk = raw.read(1 << 20)
+                    if not chunk:
                         break
 
-                    buffer += chunk
+                    buf += chunk
 
                     # Look for frame boundaries
-                    while boundary in buffer:
-                        parts = buffer.split(boundary, 1)
-                        frame_data = parts[0]
-                        buffer = parts[1] if len(parts) > 1 else b''
+                    while True:
+                        idx = buf.find(boundary, scan_pos)
+                        if idx < 0:
+                            # Keep a tail unscanned in case a boundary
+                            # straddles two chunks
+                            scan_pos = max(0, len(buf) - len(boundary) + 1)
+                            break
 
                         # Extract binary data (skip headers)
-                        if b'\r\n\r\n' in frame_data:
-                            _, data = frame_data.split(b'\r\n\r\n', 1)
-
-                            if len(data) >= min_size:
-                                # Drop oldest frame if queue full
-                                if self.frame_queue.full():
-                                    try:
-                                        self.frame_queue.get_nowait()
-                                    except:
-                                        pass
-                                self.frame_queue.put(data[:min_size])
+                        header_end = buf.find(b'\r\n\r\n', 0, idx)
+                        if header_end >= 0:
+                            start = header_end + 4
+
+                            if idx - start >= min_size:
+                                # Single memcpy out of the parse buffer
+                                # into the next recycled ring slot
+                                slot = self._raw_bufs[self._raw_idx]
+                                self._raw_idx = (self._raw_idx + 1) % len(self._raw_bufs)
+                                slot[:] = memoryview(buf)[start:start + min_size]
+                                # Newest frame wins - an unconsumed one is
+                                # simply overwritten
+                                self._latest_raw = slot
+                                self._frame_ready.set()
 
                                 frame_count += 1
                                 current_time = time.time()
@@ -140,10 +274,40 @@ class RGB565StreamViewer:
                                     frame_count = 0
                                     last_time = current_time
 
+                        # Consume this frame (and its boundary marker)
+                        del buf[:idx + len(boundary)]
+                        scan_pos = 0
+
             except Exception as e:
                 print(f"Stream error: {e}, reconnecting...")
                 time.sleep(0.5)
 
+    def decoder_thread(self):
+        """Decode raw frames in parallel with receive and display
+
+        The Numba/OpenCV decode releases the GIL in its inner loop, so
+        running it on its own thread overlaps decode with both the HTTP
+        receive and the HighGUI event handling on the main thread.
+        """
+        while self.running:
+            if not self._frame_ready.wait(0.05):
+                continue
+            self._frame_ready.clear()
+            raw_data = self._latest_raw
+            if raw_data is None:
+                continue
+
+            # Half resolution for display - the window is half the sensor
+            # size, so full-res decode here would be wasted work
+            frame = self.decoder.process_frame(raw_data, rotate=self._rotation,
+                                               half=True)
+            if frame is not None:
+                # The decoder alternates between two output buffers, so
+                # the one the display holds is never the one being
+                # written - publish the reference directly, no copy
+                self._latest_bgr = frame
+                self._bgr_ready.set()
+
     def run(self):
         """Main display loop"""
         self.running = True
@@ -151,9 +315,12 @@ class RGB565StreamViewer:
         rotations = [0, 90, 180, 270]
         rotation_idx = 2  # Start with 180
 
-        # Start receiver thread
+        # Start receiver and decoder threads (imshow/waitKey must stay on
+        # the main thread - OpenCV HighGUI requirement)
         receiver = threading.Thread(target=self.receiver_thread, daemon=True)
         receiver.start()
+        decoder = threading.Thread(target=self.decoder_thread, daemon=True)
+        decoder.start()
 
         print(f"Connecting to {self.host}:{self.port}...")
         print("Controls:")
@@ -165,34 +332,29 @@ class RGB565StreamViewer:
         cv2.resizeWindow('IMX662 RGB565 Stream', 960, 550)
 
         frame_num = 0
-        last_raw_data = None
         last_displayed_frame = None
 
         while self.running:
-            # Try to get new frame
-            try:
-                raw_data = self.frame_queue.get(timeout=0.05)
-                last_raw_data = raw_data
-            except:
-                raw_data = None
-
-            current_rotation = rotations[rotation_idx]
-
-            # Process new frame if available
-            if raw_data is not None:
-                frame = self.decoder.process_frame(raw_data, rotate=current_rotation)
-                if frame is not None:
-                    last_displayed_frame = frame.copy()
-                    frame_num += 1
-
-            # Display frame
-            if last_displayed_frame is not None:
-                display_frame = last_displayed_frame.copy()
-                info = f"FPS:{self.fps:.1f} Rot:{current_rotation} Frame:{frame_num}"
-                cv2.putText(display_frame, info, (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.imshow('IMX662 RGB565 Stream', display_frame)
+            # Block on the decoded-frame event, sized to ~30 FPS: the loop
+            # wakes once per frame (or timeout) instead of spinning, and
+            # the single waitKey(1) below keeps HighGUI responsive
+            if self._bgr_ready.wait(0.033):
+                self._bgr_ready.clear()
+                frame = self._latest_bgr
             else:
+                frame = None
+
+            # Overlay and show only when a new frame arrived - the overlay
+            # fully covers its region, so it is drawn straight onto the
+            # decoded frame and no display copy is needed
+            if frame is not None:
+                last_displayed_frame = frame
+                frame_num += 1
+                info = f"FPS:{self.fps:.1f} Rot:{self._rotation} Frame:{frame_num}"
+                cv2.putText(frame, info, (10, 30),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                cv2.imshow('IMX662 RGB565 Stream', frame)
+            elif last_displayed_frame is None:
                 # Show connecting message at startup
                 connecting_img = np.zeros((550, 960, 3), dtype=np.uint8)
                 cv2.putText(connecting_img, "Connecting...", (380, 275),
@@ -202,13 +364,20 @@ class RGB565StreamViewer:
             key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
                 break
-            elif key == ord('s') and last_displayed_frame is not None:
-                filename = f"frame_{frame_num:04d}.jpg"
-                cv2.imwrite(filename, last_displayed_frame)
-                print(f"Saved: {filename}")
+            elif key == ord('s') and self._latest_raw is not None:
+                # Re-decode the newest raw frame at full resolution; the
+                # full-res buffers are untouched by the (half-res) decoder
+                # thread, so this is safe to run here
+                save_frame = self.decoder.process_frame(self._latest_raw,
+                                                        rotate=self._rotation)
+                if save_frame is not None:
+                    filename = f"frame_{frame_num:04d}.jpg"
+                    cv2.imwrite(filename, save_frame)
+                    print(f"Saved: {filename}")
             elif key == ord('r'):
                 rotation_idx = (rotation_idx + 1) % len(rotations)
-                print(f"Rotation: {rotations[rotation_idx]}")
+                self._rotation = rotations[rotation_idx]
+                print(f"Rotation: {self._rotation}")
 
         self.running = False
         cv2.destroyAllWindows()